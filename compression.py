@@ -1,10 +1,94 @@
+import asyncio
+import collections
+import concurrent.futures
+import fnmatch
+import functools
+import json
+import logging
 import os
+import shutil
+import sqlite3
 import subprocess
-from pathlib import Path
+import threading
+from pathlib import PurePath
+from types import MappingProxyType
 
 
-def convert_audio(input_path, output_format="flac", output_path=None, compression_level=5, 
-                 sample_rate=None, channels=None, bit_depth=None, extra_args=None, file_pattern="*.*"):
+logger = logging.getLogger(__name__)
+
+# FFmpeg executables, resolved once so each invocation skips the PATH search.
+# The bare names are kept as a fallback so a missing binary fails when it's used.
+FFMPEG_BIN = shutil.which('ffmpeg') or 'ffmpeg'
+FFPROBE_BIN = shutil.which('ffprobe') or 'ffprobe'
+
+# File extension used for each supported output format
+FORMAT_EXTENSIONS = MappingProxyType({
+    'flac': '.flac',
+    'mp3': '.mp3',
+    'm4a': '.m4a',
+    'wav': '.wav',
+    'ogg': '.ogg',
+    'aac': '.aac',
+    'wma': '.wma',
+    'alac': '.m4a',
+})
+
+# Input file extensions picked up by batch conversion with the default file pattern,
+# including video containers whose audio track can be extracted
+SUPPORTED_EXTENSIONS = frozenset({
+    '.3gp', '.aac', '.ac3', '.aif', '.aifc', '.aiff', '.amr', '.ape', '.au',
+    '.caf', '.dts', '.flac', '.m4a', '.m4b', '.mka', '.mp2', '.mp3', '.mpc',
+    '.oga', '.ogg', '.opus', '.spx', '.tta', '.w64', '.wav', '.wma', '.wv',
+    '.avi', '.mkv', '.mov', '.mp4', '.webm', '.wmv',
+})
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)
+
+# Global FFmpeg options: never read from stdin or prompt before overwriting. The
+# log level is added by _ffmpeg_base, depending on whether output is streamed.
+_FFMPEG_GLOBAL_ARGS = ('-nostdin', '-y', '-hide_banner', '-nostats')
+
+# Compression level used when re-encoding without an explicit compression_level
+_DEFAULT_COMPRESSION_LEVEL = 5
+
+# Number of FFmpeg log lines kept for the error message when the log is streamed
+_STDERR_TAIL_LINES = 10
+
+# Output options used when the input stream can be copied without re-encoding
+_STREAM_COPY_ARGS = ('-vn', '-c:a', 'copy')
+
+# Codec FFmpeg reports for each output format, and the input extensions whose
+# container can already hold it. Only those inputs are probed for stream copy.
+_COPY_CANDIDATES = {
+    'flac': ('flac', ('.flac', '.mka', '.mkv', '.oga', '.ogg')),
+    'mp3': ('mp3', ('.avi', '.mka', '.mkv', '.mp3', '.mp4')),
+    'm4a': ('aac', ('.3gp', '.aac', '.m4a', '.m4b', '.mka', '.mkv', '.mov', '.mp4')),
+    'ogg': ('vorbis', ('.mka', '.mkv', '.oga', '.ogg', '.webm')),
+    'wav': ('pcm_s16le', ('.avi', '.mka', '.mkv', '.mov', '.w64', '.wav')),
+}
+
+# Persistent cache of ffprobe results, opened on first use
+PROBE_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'audio_augmentation', 'probe.db'
+)
+_probe_cache = None
+_probe_cache_lock = threading.Lock()
+
+# Maximum number of files converted by a single FFmpeg process in batch mode
+_CHUNK_SIZE = 50
+
+# Batch conversions log a progress line every this many files
+_PROGRESS_INTERVAL = 100
+
+
+def _default_max_workers():
+    """Half the available cores (at most 8), since each FFmpeg process may use a couple of threads."""
+    return max(1, min(8, (os.cpu_count() or 2) // 2))
+
+
+def convert_audio(input_path, output_format="flac", output_path=None, compression_level=None, 
+                 sample_rate=None, channels=None, bit_depth=None, extra_args=None, file_pattern="*.*",
+                 max_workers=None, speed_preset=None, recursive=True, verbose=False):
     """
     Convert audio file(s) to specified format using FFmpeg.
     
@@ -16,53 +100,131 @@ def convert_audio(input_path, output_format="flac", output_path=None, compressio
         output_path (str, optional): Path to output file or directory. If None, 
                                     uses input path with appropriate extension.
         compression_level (int, optional): Compression level. For FLAC: 0-12, for MP3: 0-9.
+                                           Default is None (level 5 when re-encoding).
+                                           Inputs already in the target codec are copied
+                                           without re-encoding unless this or speed_preset
+                                           is given.
         sample_rate (int, optional): Output sample rate in Hz. Default is None (keep original).
         channels (int, optional): Number of audio channels. Default is None (keep original).
         bit_depth (int, optional): Bit depth (16, 24, or 32). Default is None (keep original).
         extra_args (list, optional): List of additional FFmpeg arguments.
         file_pattern (str, optional): File pattern for batch processing (e.g., "*.wav").
-                                     Only used when input_path is a directory.
+                                     Only used when input_path is a directory. The default
+                                     matches every file with an extension in
+                                     SUPPORTED_EXTENSIONS, which includes video containers
+                                     such as .mp4 and .mkv (only their audio is converted);
+                                     other files need an explicit pattern.
+        max_workers (int, optional): Number of files converted concurrently in batch mode.
+                                     Default is None (half the available CPU cores, at most 8).
+                                     Raises ValueError if less than 1.
+        speed_preset (int, optional): Encoder speed, 0 (slowest, best) to 9 (fastest).
+                                      For MP3 this sets LAME's algorithm quality, for M4A
+                                      values below 5 select the slower "twoloop" AAC coder.
+                                      Default is None (LAME default, fast AAC coder).
+        recursive (bool, optional): Also convert files in subdirectories, mirroring their
+                                    layout under output_path. Only used when input_path
+                                    is a directory. Default is True.
+        verbose (bool, optional): Stream FFmpeg's log to the logger line by line.
+                                  Default is False (only errors are reported).
     
     Returns:
         Union[str, list, None]: Path to output file, list of output files for batch processing,
                                or None if conversion failed.
     """
+    output_format = output_format.lower()
+    
     # Check if input_path is a directory
     if os.path.isdir(input_path):
         return _batch_convert(
             input_path, output_format, output_path, compression_level, sample_rate,
-            channels, bit_depth, extra_args, file_pattern
-        )
-    else:
-        return _single_convert(
-            input_path, output_format, output_path, compression_level, sample_rate,
-            channels, bit_depth, extra_args
+            channels, bit_depth, extra_args, file_pattern, max_workers, speed_preset, recursive,
+            verbose
         )
+    
+    if not os.path.exists(input_path):
+        logger.error("Input file not found: %s", input_path)
+        return None
+    
+    return _single_convert(
+        input_path, output_format, output_path, compression_level, sample_rate,
+        channels, bit_depth, extra_args, speed_preset=speed_preset, verbose=verbose
+    )
 
 
-def _get_format_settings(output_format, compression_level):
-    """Get the appropriate codec and format-specific settings based on output format."""
-    format_settings = {
-        'codec': [],
-        'format_args': []
-    }
+def convert_audio_multi(input_path, outputs, verbose=False):
+    """
+    Convert a single audio file to several output formats at once.
     
-    output_format = output_format.lower()
+    All outputs are written by one FFmpeg process, so the input is decoded only once
+    instead of once per format.
+    
+    Args:
+        input_path (str): Path to input audio file
+        outputs (list): One dict per output. Keys match the arguments of convert_audio:
+                        "output_format" (required), "output_path", "compression_level",
+                        "sample_rate", "channels", "bit_depth", "extra_args" and
+                        "speed_preset". Missing keys use convert_audio's defaults.
+        verbose (bool, optional): Stream FFmpeg's log to the logger line by line.
+    
+    Returns:
+        Union[list, None]: Paths to the output files, in the order of outputs,
+                           or None if conversion failed.
+    """
+    if not os.path.exists(input_path):
+        logger.error("Input file not found: %s", input_path)
+        return None
+    
+    cmd, output_files = _build_multi_command(input_path, outputs, verbose)
+    
+    # Execute the FFmpeg command
+    returncode, stderr = _run_ffmpeg(cmd, input_path, verbose)
+    if returncode != 0:
+        logger.error("Error converting %s: %s", input_path, _ffmpeg_error(returncode, stderr))
+        return None
+    
+    logger.info("Successfully converted %s to %s", input_path, ", ".join(output_files))
+    return output_files
+
+
+@functools.lru_cache(maxsize=128)
+def _get_format_settings(output_format, compression_level, sample_rate=None, channels=None,
+                         bit_depth=None, threads=0, speed_preset=None):
+    """
+    Get the appropriate codec and format-specific settings based on output format.
+    
+    Returns a (codec, format_args) pair of tuples covering every encoding option, so
+    the codec is only chosen once (e.g. the PCM variant for a WAV bit depth). Results
+    are cached, since a batch asks for the same settings for every file.
+    
+    threads is passed to FFmpeg as the encoder's -threads (0 lets FFmpeg pick). None
+    of the encoders chosen here (flac, aac, libmp3lame, libvorbis, PCM) are threaded
+    in FFmpeg, so it currently has no effect; it only matters if extra_args selects
+    a threaded encoder.
+    
+    speed_preset (0 = slowest, 9 = fastest) trades encoder effort for speed where the
+    codec supports it. VBR (-q:a) is kept for MP3, as it is usually smaller than CBR.
+    """
+    codec = []
+    format_args = []
     
     if output_format == 'flac':
-        format_settings['codec'] = ['-c:a', 'flac']
+        codec = ['-c:a', 'flac']
         if compression_level is not None:
-            format_settings['format_args'] = ['-compression_level', str(compression_level)]
+            format_args = ['-compression_level', str(compression_level)]
     
     elif output_format == 'mp3':
-        format_settings['codec'] = ['-c:a', 'libmp3lame']
+        codec = ['-c:a', 'libmp3lame']
         if compression_level is not None:
             # Map 0-9 compression level to quality (0 = highest quality, 9 = lowest)
             quality = max(0, min(9, compression_level))
-            format_settings['format_args'] = ['-q:a', str(quality)]
+            format_args = ['-q:a', str(quality)]
+        if speed_preset is not None:
+            # LAME's algorithm quality: 0 = slowest/best, 9 = fastest
+            speed = max(0, min(9, speed_preset))
+            format_args.extend(['-compression_level', str(speed)])
     
     elif output_format == 'm4a':
-        format_settings['codec'] = ['-c:a', 'aac']
+        codec = ['-c:a', 'aac']
         if compression_level is not None:
             # For AAC, higher is better quality (opposite of MP3)
             # Map compression_level 0-9 to bitrate
@@ -71,157 +233,617 @@ def _get_format_settings(output_format, compression_level):
                 5: '160k', 6: '128k', 7: '112k', 8: '96k', 9: '64k'
             }
             bitrate = bitrates.get(compression_level, '128k')
-            format_settings['format_args'] = ['-b:a', bitrate]
+            format_args = ['-b:a', bitrate]
+        # The "fast" coder is much quicker than the default "twoloop" for little quality loss
+        aac_coder = 'twoloop' if speed_preset is not None and speed_preset < 5 else 'fast'
+        format_args.extend(['-aac_coder', aac_coder])
     
     elif output_format == 'wav':
-        format_settings['codec'] = ['-c:a', 'pcm_s16le']  # Default to 16-bit PCM
+        # Default to 16-bit PCM
+        pcm_codecs = {16: 'pcm_s16le', 24: 'pcm_s24le', 32: 'pcm_s32le'}
+        codec = ['-c:a', pcm_codecs.get(bit_depth, 'pcm_s16le')]
     
     elif output_format == 'ogg':
-        format_settings['codec'] = ['-c:a', 'libvorbis']
+        codec = ['-c:a', 'libvorbis']
         if compression_level is not None:
             # Vorbis quality scale is from -1 to 10
             # Map our 0-9 scale to 0-9
             quality = max(0, min(9, compression_level))
-            format_settings['format_args'] = ['-q:a', str(quality)]
+            format_args = ['-q:a', str(quality)]
     
     else:
         # For other formats, use default codec and let FFmpeg decide
-        format_settings['codec'] = ['-c:a', 'copy']
+        codec = ['-c:a', 'copy']
+    
+    # Add sample rate if specified
+    if sample_rate:
+        format_args.extend(['-ar', str(sample_rate)])
     
-    return format_settings
+    # Add channels if specified
+    if channels:
+        format_args.extend(['-ac', str(channels)])
+    
+    # FLAC stores 24-bit audio in 32-bit samples; WAV bit depth is set by the codec above
+    if bit_depth and output_format == 'flac':
+        if bit_depth == 16:
+            format_args.extend(['-sample_fmt', 's16'])
+        elif bit_depth in (24, 32):
+            format_args.extend(['-sample_fmt', 's32'])
+    
+    # Only threaded encoders read this; every encoder selected above ignores it
+    format_args.extend(['-threads', str(threads)])
+    
+    return tuple(codec), tuple(format_args)
 
 
-def _single_convert(input_file, output_format="flac", output_file=None, compression_level=5, 
-                   sample_rate=None, channels=None, bit_depth=None, extra_args=None):
-    """Helper function to convert a single file to specified format."""
-    if not os.path.exists(input_file):
-        print(f"Input file not found: {input_file}")
+def _output_args(output_format, compression_level=None, sample_rate=None, channels=None,
+                 bit_depth=None, extra_args=None, threads=0, speed_preset=None):
+    """Build the FFmpeg output options shared by every file in a conversion."""
+    if compression_level is None:
+        compression_level = _DEFAULT_COMPRESSION_LEVEL
+    
+    # Outputs are audio only, so never decode video streams (e.g. cover art)
+    cmd = ['-vn']
+    
+    # Get format-specific settings
+    codec, format_args = _get_format_settings(
+        output_format, compression_level, sample_rate, channels, bit_depth, threads, speed_preset
+    )
+    cmd.extend(codec)
+    cmd.extend(format_args)
+    
+    # Add any extra arguments
+    if extra_args:
+        cmd.extend(extra_args)
+    
+    return cmd
+
+
+def _get_probe_cache():
+    """Open the persistent probe cache on first use; returns None if it can't be opened."""
+    global _probe_cache
+    if _probe_cache is None:
+        try:
+            os.makedirs(os.path.dirname(PROBE_CACHE_PATH), exist_ok=True)
+            connection = sqlite3.connect(PROBE_CACHE_PATH, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS probe (path TEXT, mtime INTEGER, size INTEGER, '
+                'json TEXT, PRIMARY KEY (path, mtime, size))'
+            )
+            connection.commit()
+            _probe_cache = connection
+        except (OSError, sqlite3.Error):
+            _probe_cache = False
+    return _probe_cache or None
+
+
+def _probe_codec(input_file):
+    """
+    Return the codec_name, sample_rate and channels of the first audio stream, or None.
+    
+    Results are kept in a persistent cache keyed by (path, mtime, size), so files that
+    haven't changed since an earlier run are not probed again.
+    """
+    path = os.path.abspath(input_file)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    
+    with _probe_cache_lock:
+        cache = _get_probe_cache()
+        if cache is not None:
+            try:
+                row = cache.execute(
+                    'SELECT json FROM probe WHERE path = ? AND mtime = ? AND size = ?', key
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                return json.loads(row[0])
+    
+    cmd = [
+        FFPROBE_BIN, '-v', 'error', '-select_streams', 'a:0',
+        '-show_entries', 'stream=codec_name,sample_rate,channels', '-of', 'json', path
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except (subprocess.CalledProcessError, OSError):
         return None
     
+    streams = json.loads(result.stdout).get('streams')
+    stream = streams[0] if streams else None
+    
+    # Store the result, dropping entries for older versions of the same file
+    with _probe_cache_lock:
+        if cache is not None:
+            try:
+                cache.execute('DELETE FROM probe WHERE path = ?', (path,))
+                cache.execute('INSERT INTO probe VALUES (?, ?, ?, ?)', (*key, json.dumps(stream)))
+                cache.commit()
+            except sqlite3.Error:
+                pass
+    
+    return stream
+
+
+def _can_stream_copy(input_file, output_format, sample_rate=None, channels=None,
+                     bit_depth=None, extra_args=None, compression_level=None, speed_preset=None):
+    """
+    Check whether input_file already holds the target codec, so it can be remuxed
+    with -c:a copy instead of being decoded and encoded again.
+    
+    An explicit compression level or speed preset asks for a new encode, so those
+    are never copied. WAV has no encoder settings to honour.
+    """
+    candidate = _COPY_CANDIDATES.get(output_format)
+    if candidate is None or extra_args:
+        return False
+    if output_format != 'wav' and (compression_level is not None or speed_preset is not None):
+        return False
+    codec_name, suffixes = candidate
+    
+    # Bit depth is only visible in the codec name for PCM
+    if output_format == 'wav' and bit_depth:
+        codec_name = f'pcm_s{bit_depth}le'
+    elif bit_depth:
+        return False
+    
+    if not input_file.lower().endswith(suffixes):
+        return False
+    
+    stream = _probe_codec(input_file)
+    if stream is None or stream.get('codec_name') != codec_name:
+        return False
+    if sample_rate and int(stream.get('sample_rate', 0)) != int(sample_rate):
+        return False
+    if channels and stream.get('channels') != int(channels):
+        return False
+    return True
+
+
+def _ffmpeg_base(verbose=False):
+    """Start an FFmpeg command line. Without verbose, FFmpeg only writes errors to stderr."""
+    return [FFMPEG_BIN, *_FFMPEG_GLOBAL_ARGS, '-loglevel', 'info' if verbose else 'error']
+
+
+def _ffmpeg_error(returncode, stderr):
+    """Describe a failed FFmpeg run from its captured stderr."""
+    return stderr.decode(errors='replace').strip() or f"FFmpeg exited with code {returncode}"
+
+
+def _run_ffmpeg(cmd, label, verbose=False):
+    """
+    Execute an FFmpeg command, returning (returncode, stderr).
+    
+    With verbose, FFmpeg's log is passed to the logger line by line as it is written,
+    prefixed with label (the file being converted), instead of being collected, and
+    the returned stderr only holds its last few lines. Otherwise stderr only holds
+    error messages, and is only decoded if the command failed.
+    """
+    if verbose:
+        tail = collections.deque(maxlen=_STDERR_TAIL_LINES)
+        with subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                              text=True, errors='replace', bufsize=1) as proc:
+            for line in proc.stderr:
+                line = line.rstrip()
+                logger.info("%s: %s", label, line)
+                tail.append(line)
+        return proc.returncode, '\n'.join(tail).encode()
+    
+    result = subprocess.run(cmd, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL)
+    return result.returncode, result.stderr
+
+
+def _build_command(input_file, output_format="flac", output_file=None, compression_level=None,
+                   sample_rate=None, channels=None, bit_depth=None, extra_args=None, threads=0,
+                   speed_preset=None, stream_copy=False, verbose=False):
+    """Build the FFmpeg command for a single file, returning (cmd, output_file)."""
     # Get appropriate file extension
-    format_extensions = {
-        'flac': '.flac',
-        'mp3': '.mp3',
-        'm4a': '.m4a',
-        'wav': '.wav',
-        'ogg': '.ogg',
-        'aac': '.aac',
-        'wma': '.wma',
-        'alac': '.m4a',
-    }
-    
-    output_extension = format_extensions.get(output_format.lower(), f'.{output_format}')
+    output_extension = FORMAT_EXTENSIONS.get(output_format, f'.{output_format}')
     
     if output_file is None:
         output_file = os.path.splitext(input_file)[0] + output_extension
     
     # Build the FFmpeg command
-    cmd = ['ffmpeg', '-i', input_file]
+    cmd = _ffmpeg_base(verbose)
+    cmd.extend(['-i', input_file])
     
-    # Get format-specific settings
-    format_settings = _get_format_settings(output_format, compression_level)
-    cmd.extend(format_settings['codec'])
-    cmd.extend(format_settings['format_args'])
+    # Only keep the first audio stream, unless the caller picks streams themselves
+    if not extra_args or '-map' not in extra_args:
+        cmd.extend(['-map', '0:a:0'])
     
-    # Add sample rate if specified
-    if sample_rate:
-        cmd.extend(['-ar', str(sample_rate)])
-    
-    # Add channels if specified
-    if channels:
-        cmd.extend(['-ac', str(channels)])
-    
-    # Add bit depth if specified (mainly applies to FLAC and WAV)
-    if bit_depth and output_format.lower() in ['flac', 'wav']:
-        if output_format.lower() == 'flac':
-            if bit_depth == 16:
-                cmd.extend(['-sample_fmt', 's16'])
-            elif bit_depth == 24:
-                cmd.extend(['-sample_fmt', 's32'])
-            elif bit_depth == 32:
-                cmd.extend(['-sample_fmt', 's32'])
-        elif output_format.lower() == 'wav':
-            if bit_depth == 16:
-                cmd.extend(['-c:a', 'pcm_s16le'])
-            elif bit_depth == 24:
-                cmd.extend(['-c:a', 'pcm_s24le'])
-            elif bit_depth == 32:
-                cmd.extend(['-c:a', 'pcm_s32le'])
-    
-    # Add any extra arguments
-    if extra_args:
-        cmd.extend(extra_args)
+    if stream_copy:
+        cmd.extend(_STREAM_COPY_ARGS)
+    else:
+        cmd.extend(_output_args(
+            output_format, compression_level, sample_rate, channels, bit_depth, extra_args,
+            threads, speed_preset
+        ))
     
     # Add output file
     cmd.append(output_file)
     
+    return cmd, output_file
+
+
+def _single_convert(input_file, output_format="flac", output_file=None, compression_level=None, 
+                   sample_rate=None, channels=None, bit_depth=None, extra_args=None,
+                   speed_preset=None, verbose=False):
+    """Helper function to convert a single file to specified format. input_file must exist."""
+    stream_copy = _can_stream_copy(
+        input_file, output_format, sample_rate, channels, bit_depth, extra_args,
+        compression_level, speed_preset
+    )
+    cmd, output_file = _build_command(
+        input_file, output_format, output_file, compression_level, sample_rate,
+        channels, bit_depth, extra_args, speed_preset=speed_preset, stream_copy=stream_copy,
+        verbose=verbose
+    )
+    
     # Execute the FFmpeg command
-    try:
-        result = subprocess.run(cmd, check=True, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-        print(f"Successfully converted {input_file} to {output_file}")
-        return output_file
-    except subprocess.CalledProcessError as e:
-        print(f"Error converting file: {e.stderr.decode()}")
+    returncode, stderr = _run_ffmpeg(cmd, input_file, verbose)
+    if returncode != 0:
+        logger.error("Error converting %s: %s", input_file, _ffmpeg_error(returncode, stderr))
         return None
+    
+    logger.info("Successfully converted %s to %s", input_file, output_file)
+    return output_file
 
 
-def _batch_convert(input_dir, output_format="flac", output_dir=None, compression_level=5, 
-                  sample_rate=None, channels=None, bit_depth=None, extra_args=None, 
-                  file_pattern="*.*"):
-    """Helper function to convert a directory of files to specified format."""
+async def _single_convert_async(input_file, output_format="flac", output_file=None, compression_level=None,
+                                sample_rate=None, channels=None, bit_depth=None, extra_args=None,
+                                threads=0, speed_preset=None, verbose=False):
+    """Asynchronous counterpart of _single_convert, used for batch processing. input_file must exist."""
+    stream_copy = await asyncio.to_thread(
+        _can_stream_copy, input_file, output_format, sample_rate, channels, bit_depth, extra_args,
+        compression_level, speed_preset
+    )
+    cmd, output_file = _build_command(
+        input_file, output_format, output_file, compression_level,
+        sample_rate, channels, bit_depth, extra_args, threads, speed_preset, stream_copy, verbose
+    )
+    
+    returncode, stderr = await _run_ffmpeg_async(cmd, input_file, verbose)
+    if returncode != 0:
+        logger.error("Error converting %s: %s", input_file, _ffmpeg_error(returncode, stderr))
+        return None
     
-    # Create output directory if specified and doesn't exist
-    if output_dir is not None:
-        os.makedirs(output_dir, exist_ok=True)
+    logger.debug("Successfully converted %s to %s", input_file, output_file)
+    return output_file
+
+
+async def _run_ffmpeg_async(cmd, label, verbose=False):
+    """Asynchronous counterpart of _run_ffmpeg, which doesn't block the event loop."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    if verbose:
+        tail = collections.deque(maxlen=_STDERR_TAIL_LINES)
+        async for line in proc.stderr:
+            line = line.rstrip()
+            logger.info("%s: %s", label, line.decode(errors='replace'))
+            tail.append(line)
+        return await proc.wait(), b'\n'.join(tail)
+    
+    _, stderr = await proc.communicate()
+    return proc.returncode, stderr
+
+
+def _build_chunk_command(pairs, output_format="flac", compression_level=None,
+                         sample_rate=None, channels=None, bit_depth=None, threads=0,
+                         speed_preset=None, stream_copies=None, verbose=False):
+    """
+    Build one FFmpeg command converting every (input_file, output_file) pair.
     
-    # Get all matching files in the directory
-    audio_files = list(Path(input_dir).glob(file_pattern))
+    stream_copies optionally holds one flag per pair, marking inputs that are remuxed
+    with -c:a copy instead of being re-encoded.
+    """
+    cmd = _ffmpeg_base(verbose)
+    for input_file, _ in pairs:
+        cmd.extend(['-i', input_file])
+    
+    # Each input gets its own output, with the same settings repeated per output
+    output_args = _output_args(
+        output_format, compression_level, sample_rate, channels, bit_depth,
+        threads=threads, speed_preset=speed_preset
+    )
+    for index, (_, output_file) in enumerate(pairs):
+        # FFmpeg copies tags and chapters from the first input by default, so point
+        # each output at its own input's
+        cmd.extend(['-map', f'{index}:a:0', '-map_metadata', str(index),
+                    '-map_chapters', str(index)])
+        cmd.extend(_STREAM_COPY_ARGS if stream_copies and stream_copies[index] else output_args)
+        cmd.append(output_file)
+    
+    return cmd
+
+
+def _build_multi_command(input_file, outputs, verbose=False):
+    """Build one FFmpeg command writing input_file to every output spec, returning (cmd, output_files)."""
+    cmd = _ffmpeg_base(verbose)
+    cmd.extend(['-i', input_file])
+    output_files = []
+    
+    for spec in outputs:
+        output_format = spec['output_format'].lower()
+        compression_level = spec.get('compression_level')
+        sample_rate = spec.get('sample_rate')
+        channels = spec.get('channels')
+        bit_depth = spec.get('bit_depth')
+        extra_args = spec.get('extra_args')
+        
+        output_file = spec.get('output_path')
+        if output_file is None:
+            output_extension = FORMAT_EXTENSIONS.get(output_format, f'.{output_format}')
+            output_file = os.path.splitext(input_file)[0] + output_extension
+        
+        # Every output reads the same decoded stream
+        if not extra_args or '-map' not in extra_args:
+            cmd.extend(['-map', '0:a:0'])
+        
+        speed_preset = spec.get('speed_preset')
+        
+        if _can_stream_copy(input_file, output_format, sample_rate, channels, bit_depth, extra_args,
+                            compression_level, speed_preset):
+            cmd.extend(_STREAM_COPY_ARGS)
+        else:
+            cmd.extend(_output_args(
+                output_format, compression_level, sample_rate, channels, bit_depth, extra_args,
+                speed_preset=speed_preset
+            ))
+        
+        cmd.append(output_file)
+        output_files.append(output_file)
     
-    if not audio_files:
-        print(f"No files matching pattern '{file_pattern}' found in {input_dir}")
-        return []
+    return cmd, output_files
+
+
+async def _chunk_convert_async(pairs, output_format="flac", compression_level=None,
+                               sample_rate=None, channels=None, bit_depth=None, extra_args=None,
+                               threads=0, speed_preset=None, verbose=False):
+    """
+    Convert a chunk of (input_file, output_file) pairs with a single FFmpeg process.
     
-    # Get appropriate file extension
-    format_extensions = {
-        'flac': '.flac',
-        'mp3': '.mp3',
-        'm4a': '.m4a',
-        'wav': '.wav',
-        'ogg': '.ogg',
-        'aac': '.aac',
-        'wma': '.wma',
-        'alac': '.m4a',
-    }
-    
-    output_extension = format_extensions.get(output_format.lower(), f'.{output_format}')
-    
-    successful_conversions = []
-    for audio_file in audio_files:
-        audio_path = str(audio_file)
+    Running many short files through one process pays FFmpeg's start-up cost once per
+    chunk instead of once per file. If the chunk fails, any partial outputs it created
+    are removed and the files are retried one by one so a single bad input doesn't sink
+    the others.
+    """
+    if len(pairs) > 1 and not extra_args:
+        stream_copies = await asyncio.gather(*(
+            asyncio.to_thread(
+                _can_stream_copy, input_file, output_format, sample_rate, channels, bit_depth,
+                None, compression_level, speed_preset
+            )
+            for input_file, _ in pairs
+        ))
+        cmd = _build_chunk_command(
+            pairs, output_format, compression_level, sample_rate, channels, bit_depth,
+            threads, speed_preset, stream_copies, verbose
+        )
+        # Only outputs that don't exist yet are ours to clean up if the chunk fails
+        new_outputs = [output_file for _, output_file in pairs
+                       if not os.path.lexists(output_file)]
+        # FFmpeg numbers the chunk's inputs in its log, so name the chunk by its range
+        label = f"{pairs[0][0]} .. {pairs[-1][0]} ({len(pairs)} files)"
+        returncode, _ = await _run_ffmpeg_async(cmd, label, verbose)
+        if returncode == 0:
+            for input_file, output_file in pairs:
+                logger.debug("Successfully converted %s to %s", input_file, output_file)
+            return [output_file for _, output_file in pairs]
         
-        # Skip files that are already in the target format
-        if audio_path.lower().endswith(output_extension):
-            continue
+        for output_file in new_outputs:
+            try:
+                os.remove(output_file)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not remove partial output %s: %s", output_file, e)
+    
+    results = []
+    for input_file, output_file in pairs:
+        results.append(await _single_convert_async(
+            input_file, output_format, output_file, compression_level,
+            sample_rate, channels, bit_depth, extra_args, threads, speed_preset, verbose
+        ))
+    return results
+
+
+async def _convert_worker(queue, pairs, chunk_size, results, progress, *args):
+    """Convert chunks from the queue until it is empty, storing results by pair index."""
+    while True:
+        try:
+            start = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        stop = min(start + chunk_size, len(pairs))
+        results[start:stop] = await _chunk_convert_async(pairs[start:stop], *args)
         
-        if output_dir is not None:
-            # Create output file path in the output directory
-            filename = os.path.basename(audio_path)
-            base_name = os.path.splitext(filename)[0]
-            output_path = os.path.join(output_dir, base_name + output_extension)
+        # Workers share one event loop, so the counter needs no locking
+        previous = progress[0]
+        progress[0] += stop - start
+        if progress[0] // _PROGRESS_INTERVAL > previous // _PROGRESS_INTERVAL:
+            logger.info("Processed %d/%d files", progress[0], len(pairs))
+
+
+async def _run_chunks(pairs, chunk_size, max_workers, *args):
+    """
+    Convert every (input_file, output_file) pair in chunks of chunk_size, using a fixed
+    pool of at most max_workers workers. Returns one result per pair, in input order.
+    """
+    # Chunks are queued as start offsets and only sliced out of pairs when a
+    # worker picks them up, so the file list is never copied as a whole
+    queue = asyncio.Queue()
+    for start in range(0, len(pairs), chunk_size):
+        queue.put_nowait(start)
+    
+    results = [None] * len(pairs)
+    progress = [0]
+    workers = [
+        asyncio.create_task(_convert_worker(queue, pairs, chunk_size, results, progress, *args))
+        for _ in range(min(max_workers, queue.qsize()))
+    ]
+    await asyncio.gather(*workers)
+    return results
+
+
+def _matches_pattern(filename, file_pattern, output_extension):
+    """Check whether a directory entry should be converted in batch mode."""
+    name = filename.lower()
+    if name.endswith(output_extension):
+        return False
+    
+    # The default pattern selects audio files by extension, without fnmatch
+    if file_pattern == "*.*":
+        return name.endswith(_SUPPORTED_SUFFIXES)
+    return fnmatch.fnmatch(filename, file_pattern)
+
+
+def _scan_audio_files(input_dir, file_pattern, output_extension, recursive=True, exclude_dir=None):
+    """
+    Yield (path, relative_path) for every file in input_dir that should be converted.
+    
+    Subdirectories are walked when recursive is True. Symlinked directories are not
+    followed, and exclude_dir (typically the output directory) is skipped. Unreadable
+    subdirectories are skipped with a warning; an unreadable input_dir raises OSError.
+    """
+    pending = [(input_dir, '')]
+    while pending:
+        directory, rel_dir = pending.pop()
+        try:
+            scan = os.scandir(directory)
+        except OSError as e:
+            if directory is input_dir:
+                raise
+            logger.warning("Skipping unreadable directory %s: %s", directory, e)
+            continue
+        with scan as entries:
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and os.path.abspath(entry.path) != exclude_dir:
+                        pending.append((entry.path, rel_path))
+                elif _matches_pattern(entry.name, file_pattern, output_extension) and entry.is_file():
+                    yield entry.path, rel_path
+
+
+@functools.lru_cache(maxsize=None)
+def _warm_ffmpeg():
+    """
+    Run `ffmpeg -version` once per process to pull FFmpeg and its shared libraries
+    into the OS page cache before a batch starts many FFmpeg processes at once.
+    """
+    try:
+        subprocess.run([FFMPEG_BIN, '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        pass
+
+
+def _run_coroutine(main, *args):
+    """
+    Run main(*args) to completion from synchronous code and return its result.
+    
+    asyncio.run can't be called while an event loop is already running in this
+    thread (Jupyter, async applications), so in that case it runs on a worker
+    thread instead. The coroutine is only created on the thread that awaits it.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(main(*args))
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(main(*args))).result()
+
+
+def _plan_batch(input_dir, output_dir, output_extension, file_pattern="*.*", recursive=True):
+    """
+    Pair every matching file under input_dir with its output path.
+    
+    Files already in the target format are filtered out during the scan, and output
+    subdirectories are created here, so the workers only receive conversions that
+    can run as-is. Each output path is planned at most once.
+    """
+    exclude_dir = os.path.abspath(output_dir) if output_dir is not None else None
+    output_root = PurePath(output_dir) if output_dir is not None else None
+    pairs = []
+    created_dirs = set()
+    planned_outputs = {}
+    for audio_path, rel_path in _scan_audio_files(
+        input_dir, file_pattern, output_extension, recursive, exclude_dir
+    ):
+        if output_root is not None:
+            # Mirror the file's relative location inside the output directory
+            output_path = output_root / PurePath(rel_path).with_suffix(output_extension)
         else:
             # Create output file in the same directory
-            output_path = os.path.splitext(audio_path)[0] + output_extension
+            output_path = PurePath(audio_path).with_suffix(output_extension)
         
-        # Convert the file
-        result = _single_convert(
-            audio_path, output_format, output_path, compression_level,
-            sample_rate, channels, bit_depth, extra_args
-        )
+        # Inputs sharing a stem (song.mp3, song.wav) map to the same output; FFmpeg
+        # would write both into one file, so only the first one is converted
+        output_key = os.path.normcase(os.path.abspath(output_path))
+        if output_key in planned_outputs:
+            logger.warning("Skipping %s: %s is already the output for %s",
+                           audio_path, output_path, planned_outputs[output_key])
+            continue
+        planned_outputs[output_key] = audio_path
         
-        if result:
-            successful_conversions.append(result)
+        parent = output_path.parent
+        if output_root is not None and parent not in created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            created_dirs.add(parent)
+        
+        # Paths only go to FFmpeg from here on, so keep them as plain strings
+        pairs.append((audio_path, str(output_path)))
+    
+    return pairs
+
+
+def _batch_convert(input_dir, output_format="flac", output_dir=None, compression_level=None, 
+                  sample_rate=None, channels=None, bit_depth=None, extra_args=None, 
+                  file_pattern="*.*", max_workers=None, speed_preset=None, recursive=True,
+                  verbose=False):
+    """Helper function to convert a directory of files to specified format."""
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    elif max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    
+    # Create output directory if specified and doesn't exist
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    # Get appropriate file extension
+    output_extension = FORMAT_EXTENSIONS.get(output_format, f'.{output_format}')
+    
+    # Work out every conversion up front, then hand them all to the workers
+    pairs = _plan_batch(input_dir, output_dir, output_extension, file_pattern, recursive)
+    
+    if not pairs:
+        logger.warning("No files matching pattern '%s' found in %s", file_pattern, input_dir)
+        return []
+    
+    # Group the files into chunks, one FFmpeg process each, while still
+    # producing enough chunks to keep every worker busy
+    chunk_size = max(1, min(_CHUNK_SIZE, -(-len(pairs) // max_workers)))
+    
+    # Per-encoder thread cap for threaded encoders set through extra_args. It doesn't
+    # bound the total: a chunk runs one encoder per file in the same process
+    threads = max(1, (os.cpu_count() or 1) // max_workers)
+    
+    _warm_ffmpeg()
+    
+    # Convert the chunks concurrently; results come back in input order
+    results = _run_coroutine(
+        _run_chunks, pairs, chunk_size, max_workers, output_format, compression_level,
+        sample_rate, channels, bit_depth, extra_args, threads, speed_preset, verbose
+    )
+    successful_conversions = [result for result in results if result]
     
-    print(f"Converted {len(successful_conversions)} files to {output_format} format")
+    logger.info("Converted %d files to %s format", len(successful_conversions), output_format)
     return successful_conversions
 
 
@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import compression
+
+
+class BuildChunkCommandTest(unittest.TestCase):
+    pairs = [
+        ('in/a.mp3', 'out/a.flac'),
+        ('in/b.mp3', 'out/b.flac'),
+        ('in/c.ogg', 'out/c.flac'),
+    ]
+
+    def _output_options(self, cmd, index):
+        """Return the options given for the output of input number index."""
+        start = cmd.index(f'{index}:a:0') - 1
+        return cmd[start:cmd.index(self.pairs[index][1])]
+
+    def test_inputs_listed_in_order(self):
+        cmd = compression._build_chunk_command(self.pairs)
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+        self.assertEqual(inputs, [input_file for input_file, _ in self.pairs])
+
+    def test_each_output_maps_its_own_input(self):
+        cmd = compression._build_chunk_command(self.pairs)
+        for index in range(len(self.pairs)):
+            options = self._output_options(cmd, index)
+            self.assertEqual(options[:6], [
+                '-map', f'{index}:a:0', '-map_metadata', str(index), '-map_chapters', str(index),
+            ])
+            self.assertIn('flac', options)
+
+    def test_stream_copy_outputs_keep_their_own_metadata(self):
+        cmd = compression._build_chunk_command(self.pairs, stream_copies=[False, True, False])
+        options = self._output_options(cmd, 1)
+        self.assertEqual(options, [
+            '-map', '1:a:0', '-map_metadata', '1', '-map_chapters', '1',
+            *compression._STREAM_COPY_ARGS,
+        ])
+        self.assertNotIn('copy', self._output_options(cmd, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()